@@ -52,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'books.routing.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'api.urls'
@@ -93,8 +94,25 @@ connect(
     db=os.environ.get("MONGO_DB_NAME", "books_db"),
     host=os.environ.get("MONGO_HOST", "localhost"),
     port=int(os.environ.get("MONGO_PORT", 27017)),
+    replicaset=os.environ.get("MONGO_REPLICA_SET") or None,
 )
 
+# Catalogue reads go to secondaries no staler than this many seconds
+# (MongoDB requires at least 90).
+MONGO_READ_MAX_STALENESS = max(int(os.environ.get("MONGO_READ_MAX_STALENESS", 90)), 90)
+
+# After a write, the client's reads stay on the primary for this many seconds.
+# A secondary may lag up to the max staleness plus one 10s heartbeat, so the
+# window is never shorter than that.
+READ_YOUR_WRITES_WINDOW = max(
+    int(os.environ.get("READ_YOUR_WRITES_WINDOW", 0)),
+    MONGO_READ_MAX_STALENESS + 10,
+)
+
+# Cached reference data (genres) re-checks its version stamp at most this
+# often, in seconds.
+REFERENCE_DATA_CHECK_INTERVAL = float(os.environ.get("REFERENCE_DATA_CHECK_INTERVAL", 1))
+
 DATABASES = {}
 
 # Password validation
@@ -115,6 +133,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing runs in a process pool of this size. Each server process
+# starts its own pool, so N server processes run N * PASSWORD_HASHING_WORKERS
+# hashing processes; size it against the CPU count divided by N. At most
+# PASSWORD_HASHING_MAX_PENDING hashes are queued at once; requests that wait
+# longer than PASSWORD_HASHING_ACQUIRE_TIMEOUT seconds for a slot get a 503.
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_MAX_PENDING = int(
+    os.environ.get("PASSWORD_HASHING_MAX_PENDING", PASSWORD_HASHING_WORKERS * 4)
+)
+PASSWORD_HASHING_ACQUIRE_TIMEOUT = float(os.environ.get("PASSWORD_HASHING_ACQUIRE_TIMEOUT", 1))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from bson import ObjectId
+from django.conf import settings
+
+MAX_CACHED_MISSES = 1024
+
+
+class ReferenceDataCache:
+    """
+    Per-process cache of a small, rarely-changing collection.
+
+    All documents are loaded at once and kept by id, with ids grouped by
+    name. The version stamp in `version_document` is re-read at most every
+    REFERENCE_DATA_CHECK_INTERVAL seconds, and the collection is reloaded
+    only when the stamp has moved, so changes made by other workers are
+    picked up without a full reload on every lookup.
+
+    The stamp is bumped by invalidate(). Document.save and delete of the
+    cached document call it; queryset update() and delete() bypass those
+    and must call invalidate() themselves.
+    """
+
+    def __init__(self, document, version_document):
+        self.document = document
+        self.version_document = version_document
+        self.name = document._get_collection_name()
+        self._by_id = {}
+        self._ids_by_name = {}
+        self._misses = set()
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _stored_version(self):
+        return self.version_document.objects(name=self.name).scalar("version").first() or 0
+
+    def _load_documents(self):
+        return list(self.document.objects.all())
+
+    def _refresh(self, force=False):
+        if not force and time.monotonic() - self._checked_at < settings.REFERENCE_DATA_CHECK_INTERVAL:
+            return
+        with self._lock:
+            version = self._stored_version()
+            if version != self._version:
+                documents = self._load_documents()
+                ids_by_name = {}
+                for document in documents:
+                    ids_by_name.setdefault(document.name, []).append(document.id)
+                self._by_id = {str(document.id): document for document in documents}
+                self._ids_by_name = ids_by_name
+                self._misses = set()
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def get(self, document_id):
+        """
+        Returns the cached document with the given id, or None.
+
+        The first miss on an id forces a version check, so a document just
+        created by another worker is still found. Ids still missing after
+        that are remembered until the next reload, so dangling references
+        and repeated bogus ids do not query the database again.
+        """
+        key = str(document_id)
+        if not ObjectId.is_valid(key):
+            return None
+        self._refresh()
+        document = self._by_id.get(key)
+        if document is None and key not in self._misses:
+            self._refresh(force=True)
+            document = self._by_id.get(key)
+            if document is None:
+                if len(self._misses) >= MAX_CACHED_MISSES:
+                    self._misses = set()
+                self._misses.add(key)
+        return document
+
+    def ids_by_name(self, name):
+        """
+        Returns the ids of all cached documents with the given name.
+        """
+        self._refresh()
+        return list(self._ids_by_name.get(name, []))
+
+    def invalidate(self):
+        """
+        Bumps the stored version so every worker reloads on its next check.
+        """
+        self.version_document.objects(name=self.name).update_one(inc__version=1, upsert=True)
+        self._checked_at = 0.0
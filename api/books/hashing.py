@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class HashingServiceBusy(APIException):
+    """
+    Raised when every password hashing slot is taken.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many login attempts in progress, please retry shortly."
+    default_code = "hashing_busy"
+
+
+def _init_worker():
+    """
+    Prepares a pool process to use the project's password hashers.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+    django.setup()
+
+
+def _make_password(raw_password):
+    return hashers.make_password(raw_password)
+
+
+def _check_password(raw_password, encoded):
+    rehashed = []
+    is_correct = hashers.check_password(
+        raw_password, encoded, setter=lambda raw: rehashed.append(hashers.make_password(raw))
+    )
+    return is_correct, rehashed[0] if rehashed else None
+
+
+class PasswordHashingService:
+    """
+    Runs password hashing in a bounded process pool.
+
+    At most `max_pending` jobs are queued or running at once. A caller that
+    cannot get a slot within `acquire_timeout` seconds gets HashingServiceBusy
+    instead of blocking its request worker.
+
+    Pool processes are spawned, not forked. The pool starts lazily in a
+    request thread, and forking a threaded process can deadlock the child.
+    """
+
+    def __init__(self, workers, max_pending, acquire_timeout):
+        self.workers = workers
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _submit(self, fn, *args):
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A pool process died; start a fresh pool for the next job.
+            self._discard_executor(executor)
+            raise
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise HashingServiceBusy()
+        try:
+            try:
+                return self._submit(fn, *args)
+            except BrokenProcessPool:
+                # Retry once on a fresh pool; a second failure is a real
+                # error and goes up as a 500, not as load shedding.
+                logger.exception("Password hashing pool broke, retrying on a fresh pool")
+                return self._submit(fn, *args)
+        finally:
+            self._slots.release()
+
+    def make_password(self, raw_password):
+        """
+        Hashes a raw password with the preferred hasher.
+        """
+        return self._run(_make_password, raw_password)
+
+    def check_password(self, raw_password, encoded):
+        """
+        Checks a raw password against a stored hash.
+        Returns:
+            tuple: (is_correct, new_hash). new_hash is set when the stored
+            hash was made with outdated hasher parameters.
+        """
+        return self._run(_check_password, raw_password, encoded)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service():
+    """
+    Returns the per-process password hashing service.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PasswordHashingService(
+                workers=settings.PASSWORD_HASHING_WORKERS,
+                max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+                acquire_timeout=settings.PASSWORD_HASHING_ACQUIRE_TIMEOUT,
+            )
+        return _service
@@ -0,0 +1,54 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+from books.hashing import HashingServiceBusy, get_hashing_service
+
+
+class Command(BaseCommand):
+    """
+    Django management command to measure password check throughput
+    when many request threads log in at once.
+    """
+    help = 'Benchmarks login password checks under concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Concurrent request threads')
+        parser.add_argument('--logins', type=int, default=200, help='Total password checks')
+        parser.add_argument('--inline', action='store_true', help='Hash in the request thread, without the pool')
+
+    def handle(self, *args, **options):
+        service = get_hashing_service()
+        password = "benchmark-password"
+        encoded = make_password(password)
+
+        if options['inline']:
+            def login():
+                return check_password(password, encoded)
+        else:
+            def login():
+                return service.check_password(password, encoded)[0]
+
+        if not options['inline']:
+            login()  # start the pool processes outside the measurement
+
+        rejected = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            futures = [pool.submit(login) for _ in range(options['logins'])]
+            for future in futures:
+                try:
+                    future.result()
+                except HashingServiceBusy:
+                    rejected += 1
+        elapsed = time.perf_counter() - started
+        service.shutdown()
+
+        mode = "inline" if options['inline'] else f"pool of {service.workers}"
+        completed = options['logins'] - rejected
+        self.stdout.write(
+            f"{mode}: {completed} logins in {elapsed:.2f}s "
+            f"({completed / elapsed:.1f}/s) with {options['threads']} threads, {rejected} rejected"
+        )
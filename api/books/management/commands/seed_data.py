@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from django.core.management.base import BaseCommand
-from books.models import User, Genre, Book, BorrowRecord
+from books.models import User, Genre, Book, BorrowRecord, genre_cache
 
 
 class Command(BaseCommand):
@@ -14,6 +14,7 @@ class Command(BaseCommand):
         BorrowRecord.objects.delete()
         Book.objects.delete()
         Genre.objects.delete()
+        genre_cache.invalidate()
         User.objects.delete()
 
         admin = User(name="Admin", email="admin@example.com")
@@ -1,10 +1,12 @@
 from datetime import datetime, UTC
-from django.contrib.auth.hashers import make_password, check_password
 from mongoengine import (
     Document, StringField, ReferenceField, BooleanField,
-    DateTimeField, EmailField
+    DateTimeField, EmailField, IntField
 )
 
+from .cache import ReferenceDataCache
+from .hashing import get_hashing_service
+
 
 class User(Document):
     """
@@ -21,24 +23,59 @@ class User(Document):
         """
         Hashes and sets the password.
         """
-        self.password = make_password(raw_password)
+        self.password = get_hashing_service().make_password(raw_password)
 
     def check_password(self, raw_password):
         """
         Checks if the provided password matches the stored hash.
+        Re-hashes the password if the hasher parameters changed. Only the
+        hash is written, and only if nobody changed it in the meantime.
         """
-        return check_password(raw_password, self.password)
+        is_correct, new_hash = get_hashing_service().check_password(raw_password, self.password)
+        if is_correct and new_hash:
+            User.objects(id=self.id, password=self.password).update_one(set__password=new_hash)
+            self.password = new_hash
+        return is_correct
+
+
+class ReferenceDataVersion(Document):
+    """
+    Version stamp of a reference collection, bumped on every change.
+    """
+    name = StringField(primary_key=True)
+    version = IntField(default=0)
 
 
 class Genre(Document):
     """
     Represents a book genre/category.
+
+    Genres are served from genre_cache. Queryset update() and delete()
+    skip save/delete below, so call genre_cache.invalidate() after them.
     """
     name = StringField(required=True, max_length=50)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the genre and invalidates the genre cache in all workers.
+        """
+        result = super().save(*args, **kwargs)
+        genre_cache.invalidate()
+        return result
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the genre and invalidates the genre cache in all workers.
+        """
+        super().delete(*args, **kwargs)
+        genre_cache.invalidate()
+
+
+genre_cache = ReferenceDataCache(Genre, ReferenceDataVersion)
+
 
 class Book(Document):
     """
@@ -54,6 +91,16 @@ class Book(Document):
     def __str__(self):
         return self.title
 
+    @property
+    def genre_id(self):
+        """
+        Returns the stored genre id without dereferencing the genre.
+        """
+        genre = self._data.get("genre")
+        if genre is None:
+            return None
+        return self._fields["genre"].to_mongo(genre)
+
 
 class BorrowRecord(Document):
     """
@@ -82,3 +129,18 @@ class BorrowRecord(Document):
             self.book.is_borrowed = True
             self.book.save()
         return super().save(*args, **kwargs)
+
+
+class RecentWrite(Document):
+    """
+    Time of a user's latest write, used to keep their reads on the primary.
+    Stale entries are removed by a TTL index after a day.
+    """
+    user_id = StringField(primary_key=True)
+    written_at = DateTimeField(required=True)
+
+    meta = {
+        'indexes': [
+            {'fields': ['written_at'], 'expireAfterSeconds': 24 * 60 * 60},
+        ],
+    }
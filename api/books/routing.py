@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, UTC
+
+from django.conf import settings
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from rest_framework.permissions import SAFE_METHODS
+
+from .models import RecentWrite
+
+RECENT_WRITE_COOKIE = "books_recent_write"
+
+# Unsafe endpoints that issue tokens but write no catalogue data.
+NON_WRITING_URL_NAMES = {"token-obtain-pair", "token-refresh"}
+
+
+def _user_id(user):
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return getattr(user, "id", None)
+
+
+def mark_recent_write(user):
+    """
+    Records that the user has just written, so every server process
+    keeps their reads on the primary for READ_YOUR_WRITES_WINDOW seconds.
+    """
+    user_id = _user_id(user)
+    if user_id is None:
+        return
+    RecentWrite.objects(user_id=str(user_id)).update_one(
+        set__written_at=datetime.now(UTC), upsert=True
+    )
+
+
+def has_recent_write(request):
+    """
+    Checks whether the user, or the browser, wrote within the window.
+
+    The per-user record covers API clients; the signed cookie also covers
+    anonymous browser sessions without a database round trip.
+    """
+    marker = request.get_signed_cookie(
+        RECENT_WRITE_COOKIE,
+        default=None,
+        salt=RECENT_WRITE_COOKIE,
+        max_age=settings.READ_YOUR_WRITES_WINDOW,
+    )
+    if marker is not None:
+        return True
+    user_id = _user_id(request.user)
+    if user_id is None:
+        return False
+    since = datetime.now(UTC) - timedelta(seconds=settings.READ_YOUR_WRITES_WINDOW)
+    return RecentWrite.objects(user_id=str(user_id), written_at__gte=since).first() is not None
+
+
+def read_preference_for(request):
+    """
+    Returns the read preference for a catalogue read.
+
+    Reads go to secondaries no staler than MONGO_READ_MAX_STALENESS,
+    unless the user wrote recently and must see their own changes.
+    """
+    if has_recent_write(request):
+        return Primary()
+    return SecondaryPreferred(max_staleness=settings.MONGO_READ_MAX_STALENESS)
+
+
+def is_write(request, response):
+    """
+    Checks whether a request changed data: a successful unsafe request
+    to anything but the token endpoints.
+    """
+    if request.method in SAFE_METHODS or not 200 <= response.status_code < 300:
+        return False
+    match = getattr(request, "resolver_match", None)
+    return match is None or match.url_name not in NON_WRITING_URL_NAMES
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks the user, and the browser via a signed cookie, after every write,
+    so their reads stay on the primary for READ_YOUR_WRITES_WINDOW seconds.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if is_write(request, response):
+            # DRF copies the authenticated user onto the Django request.
+            mark_recent_write(getattr(request, "user", None))
+            response.set_signed_cookie(
+                RECENT_WRITE_COOKIE,
+                "1",
+                salt=RECENT_WRITE_COOKIE,
+                max_age=settings.READ_YOUR_WRITES_WINDOW,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class SecondaryReadMixin:
+    """
+    Routes list reads of a view to secondaries.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return queryset.read_preference(read_preference_for(self.request))
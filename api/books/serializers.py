@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import Book, Genre, User
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from .hashing import get_hashing_service
+from .models import Book, Genre, User, genre_cache
 from mongoengine.errors import DoesNotExist
 
 
@@ -17,28 +20,59 @@ class UserSerializer(serializers.Serializer):
         return user
 
 
+class TokenObtainSerializer(serializers.Serializer):
+    email = serializers.EmailField(write_only=True)
+    password = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        try:
+            user = User.objects.get(email=attrs["email"])
+        except DoesNotExist:
+            # Hash anyway, so unknown emails take as long as wrong passwords.
+            get_hashing_service().make_password(attrs["password"])
+            user = None
+        if user is None or not user.check_password(attrs["password"]):
+            raise AuthenticationFailed(
+                "No active account found with the given credentials", "no_active_account"
+            )
+        refresh = RefreshToken.for_user(user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+class GenreField(serializers.CharField):
+    """
+    Accepts a genre id and represents the genre by its name.
+    Both are resolved through the genre cache, without dereferencing.
+    """
+
+    def get_attribute(self, instance):
+        return instance.genre_id
+
+    def to_representation(self, value):
+        genre = genre_cache.get(value)
+        return genre.name if genre else None
+
+
 class BookSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField()
     author = serializers.CharField()
     description = serializers.CharField(allow_blank=True, required=False)
-    genre = serializers.CharField()
+    genre = GenreField()
     is_borrowed = serializers.BooleanField(read_only=True)
 
     def create(self, validated_data):
-        try:
-            genre = Genre.objects.get(id=validated_data.pop("genre"))
-        except DoesNotExist:
+        genre = genre_cache.get(validated_data.pop("genre"))
+        if genre is None:
             raise serializers.ValidationError({"genre": "Genre not found."})
         return Book.objects.create(genre=genre, **validated_data)
 
     def update(self, instance, validated_data):
         if "genre" in validated_data:
-            try:
-                genre = Genre.objects.get(id=validated_data.pop("genre"))
-                instance.genre = genre
-            except DoesNotExist:
+            genre = genre_cache.get(validated_data.pop("genre"))
+            if genre is None:
                 raise serializers.ValidationError({"genre": "Genre not found."})
+            instance.genre = genre
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
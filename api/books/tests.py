@@ -1,3 +1,242 @@
-from django.test import TestCase
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+from bson import ObjectId
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .cache import ReferenceDataCache
+from .hashing import HashingServiceBusy, PasswordHashingService
+from .models import Book, User
+from .routing import RECENT_WRITE_COOKIE, ReadYourWritesMiddleware, read_preference_for
+from .views import BookListCreateView, BorrowHistoryView
+
+
+class PasswordHashingServiceTests(SimpleTestCase):
+    def setUp(self):
+        self.service = PasswordHashingService(workers=1, max_pending=1, acquire_timeout=0.01)
+        self.addCleanup(self.service.shutdown)
+
+    def test_make_and_check_password(self):
+        encoded = self.service.make_password("secret")
+        self.assertEqual(self.service.check_password("secret", encoded), (True, None))
+        self.assertEqual(self.service.check_password("wrong", encoded), (False, None))
+
+    def test_busy_when_no_slot_is_free(self):
+        self.service._slots.acquire()
+        self.addCleanup(self.service._slots.release)
+        with self.assertRaises(HashingServiceBusy):
+            self.service.make_password("secret")
+
+    def test_broken_pool_is_retried_once_then_raised(self):
+        with patch.object(self.service, "_submit", side_effect=BrokenProcessPool) as submit, \
+                self.assertLogs("books.hashing", "ERROR"):
+            with self.assertRaises(BrokenProcessPool):
+                self.service.make_password("secret")
+        self.assertEqual(submit.call_count, 2)
+
+    def test_check_returns_new_hash_for_outdated_parameters(self):
+        hasher = PBKDF2PasswordHasher()
+        encoded = hasher.encode("secret", hasher.salt(), iterations=1000)
+        is_correct, new_hash = self.service.check_password("secret", encoded)
+        self.assertTrue(is_correct)
+        self.assertEqual(hasher.decode(new_hash)["iterations"], hasher.iterations)
+
+    def test_user_check_password_saves_rehashed_password(self):
+        hasher = PBKDF2PasswordHasher()
+        encoded = hasher.encode("secret", hasher.salt(), iterations=1000)
+        user = User(id=ObjectId(), name="Reader", email="reader@example.com", password=encoded)
+        with patch("books.models.get_hashing_service", return_value=self.service), \
+                patch.object(User, "objects") as objects:
+            self.assertTrue(user.check_password("secret"))
+        objects.assert_called_once_with(id=user.id, password=encoded)
+        objects.return_value.update_one.assert_called_once_with(set__password=user.password)
+        self.assertNotEqual(user.password, encoded)
+        self.assertEqual(hasher.decode(user.password)["iterations"], hasher.iterations)
+
+
+@override_settings(REFERENCE_DATA_CHECK_INTERVAL=60)
+class ReferenceDataCacheTests(SimpleTestCase):
+    def setUp(self):
+        document = MagicMock()
+        document._get_collection_name.return_value = "genre"
+        self.cache = ReferenceDataCache(document, MagicMock())
+        self.fiction = SimpleNamespace(id=ObjectId(), name="Fiction")
+        self.history = SimpleNamespace(id=ObjectId(), name="History")
+        self.version = patch.object(self.cache, "_stored_version", return_value=1).start()
+        self.load = patch.object(
+            self.cache, "_load_documents", return_value=[self.fiction, self.history]
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_initial_load(self):
+        self.assertIs(self.cache.get(self.fiction.id), self.fiction)
+        self.assertIs(self.cache.get(str(self.history.id)), self.history)
+        self.assertEqual(self.load.call_count, 1)
+        self.assertEqual(self.version.call_count, 1)
+
+    def test_version_bump_triggers_reload(self):
+        self.cache.get(self.fiction.id)
+        renamed = SimpleNamespace(id=self.fiction.id, name="Sci-Fi")
+        self.load.return_value = [renamed, self.history]
+        self.version.return_value = 2
+        self.cache._checked_at = 0.0
+        self.assertIs(self.cache.get(self.fiction.id), renamed)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_unchanged_version_does_not_reload(self):
+        self.cache.get(self.fiction.id)
+        self.cache._checked_at = 0.0
+        self.cache.get(self.fiction.id)
+        self.assertEqual(self.version.call_count, 2)
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_miss_forces_check_once(self):
+        self.cache.get(self.fiction.id)
+        created = SimpleNamespace(id=ObjectId(), name="Poetry")
+        self.load.return_value = [self.fiction, self.history, created]
+        self.version.return_value = 2
+        self.assertIs(self.cache.get(created.id), created)
+
+        missing = ObjectId()
+        self.assertIsNone(self.cache.get(missing))
+        checks = self.version.call_count
+        self.assertIsNone(self.cache.get(missing))
+        self.assertEqual(self.version.call_count, checks)
+
+    def test_invalid_id_skips_database(self):
+        self.assertIsNone(self.cache.get("not-an-id"))
+        self.version.assert_not_called()
+
+    def test_ids_by_name_keeps_duplicate_names(self):
+        duplicate = SimpleNamespace(id=ObjectId(), name="Fiction")
+        self.load.return_value = [self.fiction, self.history, duplicate]
+        self.assertEqual(self.cache.ids_by_name("Fiction"), [self.fiction.id, duplicate.id])
+        self.assertEqual(self.cache.ids_by_name("Poetry"), [])
+
+
+class BookListTests(SimpleTestCase):
+    def setUp(self):
+        self.fiction = SimpleNamespace(id=ObjectId(), name="Fiction")
+        self.book = Book(
+            id=ObjectId(), title="Dune", author="Frank Herbert", genre=self.fiction.id
+        )
+        self.queryset = MagicMock()
+        for method in ("read_preference", "filter", "order_by"):
+            getattr(self.queryset, method).return_value = self.queryset
+        self.queryset.__iter__.return_value = iter([self.book])
+        self.genre_cache = MagicMock()
+        self.genre_cache.get.return_value = self.fiction
+        self.genre_cache.ids_by_name.return_value = [self.fiction.id]
+        patch.object(BookListCreateView, "queryset", self.queryset).start()
+        patch("books.views.genre_cache", self.genre_cache).start()
+        patch("books.serializers.genre_cache", self.genre_cache).start()
+        self.addCleanup(patch.stopall)
+
+    def test_lists_books_filtered_by_genre_name_and_availability(self):
+        request = APIRequestFactory().get(
+            "/books/", {"genre__name": "Fiction", "is_borrowed": "false"}
+        )
+        response = BookListCreateView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.genre_cache.ids_by_name.assert_called_once_with("Fiction")
+        self.queryset.filter.assert_any_call(is_borrowed=False)
+        self.queryset.filter.assert_any_call(genre__in=[self.fiction.id])
+        self.queryset.order_by.assert_called_once_with("title")
+        self.assertEqual(response.data[0]["title"], "Dune")
+        self.assertEqual(response.data[0]["genre"], "Fiction")
+        self.genre_cache.get.assert_called_once_with(self.fiction.id)
+
+
+class ReadRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.user = SimpleNamespace(id=ObjectId(), is_authenticated=True, is_staff=False)
+        self.request = RequestFactory().get("/books/")
+        self.request.user = self.user
+        recent_write = patch("books.routing.RecentWrite").start()
+        self.lookup = recent_write.objects.return_value.first
+        self.lookup.return_value = None
+        self.addCleanup(patch.stopall)
+
+    def test_secondary_without_recent_write(self):
+        preference = read_preference_for(self.request)
+        self.assertIsInstance(preference, SecondaryPreferred)
+        self.assertEqual(preference.max_staleness, settings.MONGO_READ_MAX_STALENESS)
+
+    def test_primary_after_recent_write(self):
+        self.lookup.return_value = SimpleNamespace(user_id=str(self.user.id))
+        self.assertIsInstance(read_preference_for(self.request), Primary)
+
+    def test_primary_with_recent_write_cookie(self):
+        response = HttpResponse()
+        response.set_signed_cookie(RECENT_WRITE_COOKIE, "1", salt=RECENT_WRITE_COOKIE)
+        self.request.COOKIES[RECENT_WRITE_COOKIE] = response.cookies[RECENT_WRITE_COOKIE].value
+        self.assertIsInstance(read_preference_for(self.request), Primary)
+        self.lookup.assert_not_called()
+
+    def test_anonymous_user_skips_lookup(self):
+        self.request.user = SimpleNamespace(id=None, is_authenticated=False)
+        self.assertIsInstance(read_preference_for(self.request), SecondaryPreferred)
+        self.lookup.assert_not_called()
+
+
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.user = SimpleNamespace(id=ObjectId(), is_authenticated=True)
+        self.mark = patch("books.routing.mark_recent_write").start()
+        self.addCleanup(patch.stopall)
+
+    def call(self, method, status_code, url_name="book-borrow"):
+        request = getattr(RequestFactory(), method)("/")
+        request.user = self.user
+        request.resolver_match = SimpleNamespace(url_name=url_name)
+        middleware = ReadYourWritesMiddleware(lambda request: HttpResponse(status=status_code))
+        return middleware(request)
+
+    def test_marks_successful_write(self):
+        response = self.call("post", 200)
+        self.mark.assert_called_once_with(self.user)
+        self.assertIn(RECENT_WRITE_COOKIE, response.cookies)
+
+    def test_skips_safe_request(self):
+        response = self.call("get", 200)
+        self.mark.assert_not_called()
+        self.assertNotIn(RECENT_WRITE_COOKIE, response.cookies)
+
+    def test_skips_failed_write(self):
+        response = self.call("post", 400)
+        self.mark.assert_not_called()
+        self.assertNotIn(RECENT_WRITE_COOKIE, response.cookies)
+
+    def test_skips_token_endpoints(self):
+        for url_name in ("token-obtain-pair", "token-refresh"):
+            response = self.call("post", 200, url_name=url_name)
+            self.assertNotIn(RECENT_WRITE_COOKIE, response.cookies)
+        self.mark.assert_not_called()
+
+
+class BorrowHistoryViewTests(SimpleTestCase):
+    def test_applies_read_preference(self):
+        user = SimpleNamespace(id=ObjectId(), is_authenticated=True, is_staff=False)
+        request = Request(APIRequestFactory().get("/users/my-history/"))
+        request.user = user
+        view = BorrowHistoryView()
+        view.request = request
+        view.kwargs = {}
+        preference = SecondaryPreferred(max_staleness=90)
+        with patch("books.views.User") as user_model, \
+                patch("books.views.BorrowRecord") as borrow_record, \
+                patch("books.views.read_preference_for", return_value=preference) as read_preference:
+            user_model.objects.get.return_value = user
+            result = view.get_queryset()
+        read_preference.assert_called_once_with(request)
+        borrow_record.objects.filter.assert_called_once_with(user=user)
+        filtered = borrow_record.objects.filter.return_value
+        filtered.read_preference.assert_called_once_with(preference)
+        self.assertIs(result, filtered.read_preference.return_value)
@@ -1,5 +1,5 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 from .views import *
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -8,7 +8,7 @@ from drf_spectacular.views import (
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
-    path('token/', TokenObtainPairView.as_view(), name='token-obtain-pair'),
+    path('token/', TokenObtainView.as_view(), name='token-obtain-pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
 
     path('books/', BookListCreateView.as_view(), name='book-list-create'),
@@ -9,18 +9,20 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 from rest_framework.views import APIView
-from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework_simplejwt.views import TokenObtainPairView
 from mongoengine.errors import DoesNotExist
 
-from .models import Book, BorrowRecord, Genre, User
+from .models import Book, BorrowRecord, Genre, User, genre_cache
 from .serializers import (
     BookSerializer,
     UserSerializer,
+    TokenObtainSerializer,
     GenreSerializer,
     BorrowRecordSerializer
 )
 from .permissions import IsAdminOrReadOnly
+from .routing import SecondaryReadMixin, read_preference_for
 
 
 def get_object_or_404_mongo(cls, **kwargs):
@@ -56,6 +58,18 @@ class RegisterView(CreateAPIView):
         return super().create(request, *args, **kwargs)
 
 
+class TokenObtainView(TokenObtainPairView):
+    """
+    Obtain a JWT pair for a user.
+
+    POST:
+        Check the user's email and password and issue access and refresh tokens.
+    Returns:
+        Response: JSON with the token pair or validation errors.
+    """
+    serializer_class = TokenObtainSerializer
+
+
 class UserListView(ListAPIView):
     """
     Retrieve a list of all users (admin only).
@@ -77,7 +91,7 @@ class UserDetailView(RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class BookListCreateView(ListCreateAPIView):
+class BookListCreateView(SecondaryReadMixin, ListCreateAPIView):
     """
     List all books or create a new one.
     GET:
@@ -89,15 +103,22 @@ class BookListCreateView(ListCreateAPIView):
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
 
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = {
-        'genre__name': ['exact'],
-        'is_borrowed': ['exact'],
-    }
+    filter_backends = [OrderingFilter, SearchFilter]
     search_fields = ['author', 'published_at', 'title', 'genre']
     ordering_fields = ['title', 'author', 'published_at']
     ordering = ['title']
 
+    def get_queryset(self):
+        # django-filter needs a Django model, so the filters are applied here.
+        queryset = super().get_queryset()
+        is_borrowed = self.request.query_params.get('is_borrowed')
+        if is_borrowed is not None:
+            queryset = queryset.filter(is_borrowed=is_borrowed.lower() in ('true', '1'))
+        genre_name = self.request.query_params.get('genre__name')
+        if genre_name is not None:
+            queryset = queryset.filter(genre__in=genre_cache.ids_by_name(genre_name))
+        return queryset
+
 
 class BookDetailView(RetrieveUpdateDestroyAPIView):
     """
@@ -112,7 +133,7 @@ class BookDetailView(RetrieveUpdateDestroyAPIView):
         return get_object_or_404_mongo(Book, id=self.kwargs['pk'])
 
 
-class GenreListCreateView(ListCreateAPIView):
+class GenreListCreateView(SecondaryReadMixin, ListCreateAPIView):
     """
     List all genres or create a new one.
     GET:
@@ -226,4 +247,6 @@ class BorrowHistoryView(ListAPIView):
         if user.id != self.request.user.id and not self.request.user.is_staff:
             raise NotFound("You do not have permission to view this.")
 
-        return BorrowRecord.objects.filter(user=user)
+        return BorrowRecord.objects.filter(user=user).read_preference(
+            read_preference_for(self.request)
+        )